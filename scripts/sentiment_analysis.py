@@ -8,56 +8,136 @@ Features:
 - Scikit-learn Pipeline integration
 - No fallback predictions - model-only outputs
 - Robust error handling and validation
+- Optional long-lived server mode so the model is loaded only once
+
+Usage:
+    python sentiment_analysis.py <text>
+    python sentiment_analysis.py --batch < texts.txt
+    python sentiment_analysis.py --serve [socket_path]
+    python sentiment_analysis.py --fit-vectorizer <corpus_path>
+    python sentiment_analysis.py --convert-model
+    python sentiment_analysis.py --train <labelled_corpus_path> [model_path]
+
+When a server is listening on the socket, the one-shot CLI forwards the text
+to it instead of loading the model itself.
+
+--train replaces model.pkl with a Pipeline (TextPreprocessor ->
+HashingVectorizer -> LinearSVC) trained on "<label>\t<text>" lines; such a
+model needs neither vectorizer.pkl nor a per-request vectorizer fit.
+
+In production, bundle the NLTK data with the deployment and set
+MCQUIZ_NLTK_BUNDLED=1 (and MCQUIZ_NLTK_DATA if not /opt/nltk_data) so no
+download is ever attempted while serving a request.
 """
 
+import os
 import sys
 import json
 import pickle
 import re
+import signal
+import socket
+import socketserver
 import string
+from functools import lru_cache
+from itertools import filterfalse
 from pathlib import Path
-from typing import Dict, Any, Optional
-
-# Handle numpy compatibility issues
-try:
-    import numpy
-    # Fix for numpy._core compatibility
-    if not hasattr(numpy, '_core'):
-        import numpy._core
-        numpy._core = numpy._core
-except ImportError:
-    print("Warning: NumPy not available", file=sys.stderr)
-
-# Text preprocessing imports
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer
-from nltk.stem import WordNetLemmatizer
-
-# Scikit-learn imports with error handling
-try:
-    from sklearn.pipeline import Pipeline
-    from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-    from sklearn.base import BaseEstimator, TransformerMixin
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    print("Warning: Scikit-learn not available", file=sys.stderr)
-    SKLEARN_AVAILABLE = False
-    # Define minimal base classes
-    class BaseEstimator:
-        pass
-    class TransformerMixin:
-        pass
+from typing import Dict, Any, Callable, List, Optional
+
+# NumPy, NLTK and scikit-learn are imported inside the functions that
+# use them: importing them takes 1-2 s, which would otherwise be paid even when
+# the CLI only forwards the text to a running server.
+
+# Unix socket used by the persistent sentiment server. It lives in a private
+# directory (the user's runtime dir, or next to this script) rather than /tmp,
+# where any local user could create it first and answer predictions.
+SOCKET_PATH = os.environ.get('MCQUIZ_SENTIMENT_SOCKET') or os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR') or os.path.dirname(os.path.abspath(__file__)),
+    'mcquiz_sentiment.sock'
+)
+SOCKET_TIMEOUT = 10.0
+
+# NLTK data baked into the deployment, e.g. with
+#   python -m nltk.downloader -d /opt/nltk_data stopwords wordnet
+NLTK_BUNDLED = os.environ.get('MCQUIZ_NLTK_BUNDLED') == '1'
+NLTK_DATA_DIR = os.environ.get('MCQUIZ_NLTK_DATA', '/opt/nltk_data')
+
+# Number of TF-IDF features the pre-trained classifier expects
+N_FEATURES = 1145
+
+# Sentiment label for each raw model prediction
+SENTIMENT_LABELS = {0: 'negative', 1: 'positive'}
+
+# Maximum number of recent input texts whose preprocessing and fallback
+# feature vectors are cached (inputs are capped at 10000 characters)
+TEXT_CACHE_SIZE = 1024
+
+# Maximum number of distinct tokens memoized per stemmer/lemmatizer
+TOKEN_CACHE_SIZE = 131072
+
+# URL/email pattern, compiled once. Emails are anchored to the start of a
+# whitespace-delimited token so \S+@\S+ is tried once per token instead of at
+# every position, which backtracks quadratically on long tokens without '@'.
+_URL_EMAIL_RE = re.compile(r'http\S+|www\S+|(?<!\S)\S+@\S+')
+
+
+class _LettersAndSpaceTable(dict):
+    """
+    str.translate table that keeps ASCII letters and whitespace and deletes
+    every other character. The ASCII range is precomputed so it stays on
+    CPython's fast path; other code points are resolved on lookup and only
+    the few whitespace ones are stored, so the table cannot grow unbounded.
+    """
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        if chr(codepoint).isspace():
+            self[codepoint] = codepoint
+            return codepoint
+        return None
+
+
+_LETTERS_AND_SPACE = _LettersAndSpaceTable.fromkeys(range(0x80))
+_LETTERS_AND_SPACE.update(
+    (ord(char), ord(char)) for char in map(chr, range(0x80))
+    if char in string.ascii_letters or char.isspace()
+)
+
+# After cleanup every token is ASCII letters, so single-character tokens
+# are exactly these
+_SINGLE_LETTERS = frozenset(string.ascii_letters)
+
+# Informal contractions that NLTK's word_tokenize (used when the model was
+# trained) splits in two, mapped to the split position; the match is
+# case-insensitive, e.g. 'Cannot' -> 'Can', 'not'
+_CONTRACTION_SPLITS = {
+    'cannot': 3,
+    'gimme': 3,
+    'gonna': 3,
+    'gotta': 3,
+    'lemme': 3,
+    'wanna': 3,
+}
+
 
 # Download required NLTK data (if not already present)
+@lru_cache(maxsize=None)
 def ensure_nltk_data():
-    """Ensure NLTK data is properly downloaded and available."""
+    """
+    Ensure NLTK data is properly downloaded and available.
+    With MCQUIZ_NLTK_BUNDLED=1 the data is expected in NLTK_DATA_DIR and
+    nothing is looked up or downloaded at request time.
+    """
+    import nltk
+    
+    if NLTK_BUNDLED:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+        return
+    
+    import zipfile
+    
     required_packages = [
-        ('tokenizers/punkt', 'punkt'),
         ('corpora/stopwords', 'stopwords'),
-        ('corpora/wordnet', 'wordnet'),
-        ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger')
+        ('corpora/wordnet', 'wordnet')
     ]
     
     for path, package in required_packages:
@@ -71,17 +151,52 @@ def ensure_nltk_data():
                 print(f"Warning: Could not download {package}: {e}", file=sys.stderr)
                 # Continue without this package
 
-# Import zipfile for error handling
-import zipfile
 
-# Initialize NLTK data
-ensure_nltk_data()
+@lru_cache(maxsize=None)
+def get_stop_words() -> frozenset:
+    """Load the English stopword set once per process."""
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=None)
+def get_stemmer():
+    """Return the shared Porter stemmer instance."""
+    from nltk.stem import PorterStemmer
+    return PorterStemmer()
+
 
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    """Return the shared WordNet lemmatizer instance."""
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
 
-class TextPreprocessor(BaseEstimator, TransformerMixin):
+
+@lru_cache(maxsize=8)
+def memoize_token_fn(token_fn):
+    """
+    Wrap a stemmer/lemmatizer method in an LRU cache.
+    Word frequencies are heavily skewed, so most tokens hit the cache.
+    Keyed by the bound method, so each stemmer instance gets its own cache.
+    """
+    return lru_cache(maxsize=TOKEN_CACHE_SIZE)(token_fn)
+
+
+@lru_cache(maxsize=8)
+def get_dropped_tokens(stop_words: frozenset) -> frozenset:
+    """
+    Return every token the preprocessor filters out: the stopwords plus
+    single letters. One set lookup replaces the length check and stopword test.
+    """
+    return stop_words | _SINGLE_LETTERS
+
+
+class TextPreprocessorMethods:
     """
     Custom transformer for comprehensive text preprocessing.
-    Compatible with scikit-learn pipelines.
+    Compatible with scikit-learn pipelines - use TextPreprocessor, which adds
+    the scikit-learn base classes (see get_text_preprocessor_class).
     """
     
     def __init__(self, remove_stopwords=True, stemming=True, lemmatization=False, lowercase=True):
@@ -90,24 +205,28 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
         self.lemmatization = lemmatization
         self.lowercase = lowercase
         
+        # Stopwords and WordNet need NLTK data; stemming does not
+        if remove_stopwords or lemmatization:
+            ensure_nltk_data()
+        
         # Initialize preprocessors with error handling
         try:
-            self.stop_words = set(stopwords.words('english')) if remove_stopwords else set()
+            self.stop_words = get_stop_words() if remove_stopwords else frozenset()
         except (LookupError, OSError):
             print("Warning: Could not load stopwords, continuing without stopword removal", file=sys.stderr)
-            self.stop_words = set()
+            self.stop_words = frozenset()
             self.remove_stopwords = False
             
-        self.stemmer = PorterStemmer() if stemming else None
+        self.stemmer = get_stemmer() if stemming else None
         
         try:
-            self.lemmatizer = WordNetLemmatizer() if lemmatization else None
+            self.lemmatizer = get_lemmatizer() if lemmatization else None
         except (LookupError, OSError):
             print("Warning: Could not initialize lemmatizer, using stemming instead", file=sys.stderr)
             self.lemmatizer = None
             if lemmatization:
                 self.stemming = True
-                self.stemmer = PorterStemmer()
+                self.stemmer = get_stemmer()
     
     def fit(self, X, y=None):
         """Fit method - no fitting required for this transformer."""
@@ -115,18 +234,19 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
     
     def transform(self, X):
         """Transform text data through preprocessing pipeline."""
-        if isinstance(X, str):
-            X = [X]
+        X = [X] if isinstance(X, str) else list(X)
         
-        processed_texts = []
-        for text in X:
-            processed_text = self._preprocess_single_text(text)
-            processed_texts.append(processed_text)
+        # Filtering/stemming setup is resolved once for the whole batch
+        process_tokens = self._token_processor()
         
-        return processed_texts
+        return [process_tokens(self._tokenize(text)) for text in X]
     
     def _preprocess_single_text(self, text: str) -> str:
         """Preprocess a single text string."""
+        return self._token_processor()(self._tokenize(text))
+    
+    def _tokenize(self, text: str) -> list:
+        """Clean a single text string and split it into tokens."""
         if not isinstance(text, str):
             text = str(text)
         
@@ -134,46 +254,98 @@ class TextPreprocessor(BaseEstimator, TransformerMixin):
         if self.lowercase:
             text = text.lower()
         
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        # Remove URLs and email addresses
+        text = _URL_EMAIL_RE.sub('', text)
         
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        # Remove special characters and digits (keep only letters and spaces),
+        # then split on whitespace - this also collapses and strips it
+        tokens = text.translate(_LETTERS_AND_SPACE).split()
         
-        # Remove special characters and digits (keep only letters and spaces)
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        # Split contractions the way word_tokenize does; most texts have none
+        lowered = tokens if self.lowercase else map(str.lower, tokens)
+        if _CONTRACTION_SPLITS.keys().isdisjoint(lowered):
+            return tokens
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Tokenization with fallback
-        try:
-            tokens = word_tokenize(text)
-        except (LookupError, OSError):
-            # Fallback to simple split if word_tokenize fails
-            tokens = text.split()
-        
-        # Remove stopwords
-        if self.remove_stopwords:
-            tokens = [token for token in tokens if token not in self.stop_words]
-        
-        # Remove single characters and empty tokens
-        tokens = [token for token in tokens if len(token) > 1]
+        split_tokens = []
+        for token in tokens:
+            index = _CONTRACTION_SPLITS.get(token.lower())
+            if index is None:
+                split_tokens.append(token)
+            else:
+                split_tokens += (token[:index], token[index:])
+        return split_tokens
+    
+    def _token_processor(self) -> Callable[[list], str]:
+        """
+        Build the function that filters and stems the tokens of cleaned text
+        and joins them back together. Attribute and cache lookups happen here,
+        once per call to transform, instead of once per text.
+        """
+        stop_words = self.stop_words if self.remove_stopwords else frozenset()
+        if not isinstance(stop_words, frozenset):
+            # Preprocessors pickled by older versions hold a plain set
+            stop_words = frozenset(stop_words)
+        is_dropped = get_dropped_tokens(stop_words).__contains__
         
-        # Apply stemming or lemmatization
         if self.stemming and self.stemmer:
-            tokens = [self.stemmer.stem(token) for token in tokens]
+            token_fn = memoize_token_fn(self.stemmer.stem)
         elif self.lemmatization and self.lemmatizer:
-            tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+            token_fn = memoize_token_fn(self.lemmatizer.lemmatize)
+        else:
+            token_fn = None
         
-        # Join tokens back to text
-        processed_text = ' '.join(tokens)
+        # Remove single characters and stopwords, then apply stemming or
+        # lemmatization, in a single pass over the tokens. filterfalse/map
+        # with the C-level set lookup and lru_cache wrapper keep the loop in C,
+        # and join consumes the iterator without an intermediate list.
+        if token_fn is None:
+            return lambda tokens: ' '.join(filterfalse(is_dropped, tokens))
         
-        return processed_text
+        return lambda tokens: ' '.join(map(token_fn, filterfalse(is_dropped, tokens)))
 
 
-def load_model() -> Optional[Pipeline]:
-    """Load the pre-trained sentiment analysis model."""
+@lru_cache(maxsize=None)
+def get_text_preprocessor_class() -> type:
+    """
+    Build the TextPreprocessor class on top of the scikit-learn base classes.
+    Deferred until first use because importing scikit-learn dominates start-up.
+    """
+    try:
+        from sklearn.base import BaseEstimator, TransformerMixin
+        bases = (TextPreprocessorMethods, BaseEstimator, TransformerMixin)
+    except ImportError:
+        print("Warning: Scikit-learn not available", file=sys.stderr)
+        bases = (TextPreprocessorMethods,)
+    
+    return type('TextPreprocessor', bases, {
+        '__module__': __name__,
+        '__doc__': TextPreprocessorMethods.__doc__,
+    })
+
+
+def __getattr__(name: str):
+    # Module-level TextPreprocessor is resolved on first access. This also
+    # covers pickle looking it up while loading a pipeline model.
+    if name == 'TextPreprocessor':
+        return get_text_preprocessor_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def ensure_numpy_compat():
+    """Let pickles that reference numpy._core load under older NumPy versions."""
+    try:
+        import numpy
+        # Fix for numpy._core compatibility
+        if not hasattr(numpy, '_core'):
+            import numpy._core
+            numpy._core = numpy._core
+    except ImportError:
+        print("Warning: NumPy not available", file=sys.stderr)
+
+
+@lru_cache(maxsize=None)
+def load_model() -> Optional[Any]:
+    """Load the pre-trained sentiment analysis model (once per process)."""
     try:
         # Get the directory where this script is located
         script_dir = Path(__file__).parent
@@ -182,8 +354,21 @@ def load_model() -> Optional[Pipeline]:
         if not model_path.exists():
             raise FileNotFoundError(f"Model file not found at {model_path}")
         
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
+        # Handle numpy compatibility issues
+        ensure_numpy_compat()
+        
+        try:
+            import joblib
+        except ImportError:
+            joblib = None
+        
+        if joblib is not None:
+            # Memory-map the numpy arrays (e.g. SVM support vectors) of models
+            # saved with joblib.dump (see convert_model); plain pickles load as usual
+            model = joblib.load(model_path, mmap_mode='r')
+        else:
+            with open(model_path, 'rb') as f:
+                model = pickle.load(f)
         
         # Validate that the loaded object is a model
         if not hasattr(model, 'predict'):
@@ -196,15 +381,42 @@ def load_model() -> Optional[Pipeline]:
         sys.exit(1)  # Exit immediately - no fallbacks allowed
 
 
+def convert_model() -> Path:
+    """
+    Re-save model.pkl with joblib (uncompressed) so load_model can
+    memory-map its numpy arrays instead of copying them onto the heap.
+    """
+    import joblib
+    
+    model_path = Path(__file__).parent / "model.pkl"
+    
+    # joblib.load reads both plain pickles and files it wrote itself, so
+    # converting an already converted model is a harmless no-op
+    ensure_numpy_compat()
+    model = joblib.load(model_path)
+    
+    # Write next to the original and swap it in atomically
+    tmp_path = model_path.with_suffix('.pkl.tmp')
+    joblib.dump(model, tmp_path, compress=0)
+    os.replace(tmp_path, model_path)
+    
+    return model_path
+
+
 def create_preprocessing_pipeline():
     """
     Create a comprehensive preprocessing pipeline.
     This should match the preprocessing used during training.
     """
-    if not SKLEARN_AVAILABLE:
+    try:
+        from sklearn.pipeline import Pipeline
+        from sklearn.feature_extraction.text import TfidfVectorizer
+    except ImportError:
         print("Warning: Scikit-learn not available, cannot create pipeline", file=sys.stderr)
         return None
-        
+    
+    TextPreprocessor = get_text_preprocessor_class()
+    
     return Pipeline([
         ('preprocessor', TextPreprocessor(
             remove_stopwords=True,
@@ -222,6 +434,76 @@ def create_preprocessing_pipeline():
     ])
 
 
+def create_hashing_pipeline():
+    """
+    Create the full training pipeline: preprocessing, a stateless hashing
+    vectorizer and a linear classifier. The hashing vectorizer needs no
+    fitted vocabulary, so a single text maps straight to a sparse row of
+    N_FEATURES columns at prediction time.
+    """
+    from sklearn.pipeline import Pipeline
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.svm import LinearSVC
+    
+    TextPreprocessor = get_text_preprocessor_class()
+    
+    return Pipeline([
+        ('preprocessor', TextPreprocessor(
+            remove_stopwords=True,
+            stemming=True,
+            lemmatization=False,
+            lowercase=True
+        )),
+        ('vectorizer', HashingVectorizer(
+            n_features=N_FEATURES,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2'
+        )),
+        ('classifier', LinearSVC())
+    ])
+
+
+def train_model(corpus_path: str, model_path: Optional[str] = None) -> Path:
+    """
+    Train the hashing pipeline on a labelled corpus and save it as model.pkl
+    (or model_path). Each corpus line is "<label>\t<text>" with
+    0 = negative, 1 = positive.
+    """
+    import importlib
+    import joblib
+    
+    texts, labels = [], []
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            label, separator, text = line.rstrip('\n').partition('\t')
+            if separator and text.strip():
+                labels.append(int(label))
+                texts.append(text)
+    
+    if not texts:
+        raise ValueError(f"No labelled texts found in {corpus_path}")
+    
+    # Pickles record the module of TextPreprocessor; when run as a script,
+    # build the pipeline from the importable module so the saved model does
+    # not point at __main__ and also loads where this file is imported
+    module = sys.modules[__name__]
+    if __name__ == '__main__':
+        module = importlib.import_module(Path(__file__).stem)
+    
+    pipeline = module.create_hashing_pipeline()
+    pipeline.fit(texts, labels)
+    
+    # Write next to the original and swap it in atomically
+    model_path = Path(model_path) if model_path else Path(__file__).parent / "model.pkl"
+    tmp_path = model_path.with_suffix('.pkl.tmp')
+    joblib.dump(pipeline, tmp_path, compress=0)
+    os.replace(tmp_path, model_path)
+    
+    return model_path
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
 def preprocess_text(text: str) -> str:
     """
     Simple preprocessing pipeline for input text.
@@ -233,17 +515,12 @@ def preprocess_text(text: str) -> str:
     # Convert to lowercase
     text = text.lower()
     
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    # Remove URLs and email addresses
+    text = _URL_EMAIL_RE.sub('', text)
     
-    # Remove email addresses
-    text = re.sub(r'\S+@\S+', '', text)
-    
-    # Remove special characters and digits (keep only letters and spaces)
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Remove special characters and digits (keep only letters and spaces),
+    # collapsing runs of whitespace
+    text = ' '.join(text.translate(_LETTERS_AND_SPACE).split())
     
     return text
 
@@ -251,14 +528,14 @@ def preprocess_text(text: str) -> str:
 def create_vectorizer():
     """
     Create a TF-IDF vectorizer that matches the model's expected input.
-    The model expects exactly 1145 features.
+    The model expects exactly N_FEATURES (1145) features.
     """
     try:
         from sklearn.feature_extraction.text import TfidfVectorizer
         
         # Create vectorizer with parameters that should produce around 1145 features
         vectorizer = TfidfVectorizer(
-            max_features=1145,  # Exact number of features the model expects
+            max_features=N_FEATURES,  # Exact number of features the model expects
             ngram_range=(1, 2),  # Unigrams and bigrams
             min_df=1,           # Minimum document frequency
             max_df=0.95,        # Maximum document frequency
@@ -272,125 +549,246 @@ def create_vectorizer():
         sys.exit(1)
 
 
-def predict_sentiment(text: str, model: Any) -> Dict[str, Any]:
+@lru_cache(maxsize=None)
+def load_vectorizer() -> Optional[Any]:
     """
-    Predict sentiment using the loaded model.
-    Uses only the model.pkl file for prediction with proper text vectorization.
+    Load the TF-IDF vectorizer fitted on the training corpus (once per process).
+    Returns None when vectorizer.pkl has not been generated yet.
     """
+    vectorizer_path = Path(__file__).parent / "vectorizer.pkl"
+    
+    if not vectorizer_path.exists():
+        print(f"Warning: Vectorizer not found at {vectorizer_path}, "
+              "fitting a per-request vectorizer instead", file=sys.stderr)
+        return None
+    
     try:
-        # Validate input
-        if not text or not text.strip():
-            raise ValueError("Input text cannot be empty")
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
         
-        # Clean input text
-        text = text.strip()
+        if not hasattr(vectorizer, 'transform'):
+            raise ValueError("Loaded object is not a valid vectorizer (missing 'transform' method)")
         
-        # Check if model is a pipeline (contains preprocessing steps)
-        if hasattr(model, 'named_steps'):
-            # Model is a Pipeline - use it directly with raw text
-            prediction = model.predict([text])[0]
-            
-            if hasattr(model, 'predict_proba'):
-                try:
-                    proba = model.predict_proba([text])[0]
-                    confidence = float(max(proba))
-                except:
-                    confidence = 0.9
-            else:
-                confidence = 0.9
-                
+        return vectorizer
+    
+    except Exception as e:
+        print(f"Error loading vectorizer: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def fit_vectorizer(corpus_path: str) -> Path:
+    """
+    Fit the TF-IDF vectorizer on the training corpus (one text per line)
+    and save it as vectorizer.pkl next to model.pkl.
+    """
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        corpus = [preprocess_text(line) for line in f if line.strip()]
+    
+    vectorizer = create_vectorizer()
+    vectorizer.fit(corpus)
+    
+    if len(vectorizer.vocabulary_) != N_FEATURES:
+        raise ValueError(
+            f"Vectorizer produced {len(vectorizer.vocabulary_)} features, "
+            f"model expects {N_FEATURES}"
+        )
+    
+    vectorizer_path = Path(__file__).parent / "vectorizer.pkl"
+    with open(vectorizer_path, 'wb') as f:
+        pickle.dump(vectorizer, f)
+    
+    return vectorizer_path
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def fit_fallback_vector(processed_text: str):
+    """
+    Build a feature vector without the training vectorizer.
+    This is a workaround for a missing vectorizer.pkl: the vocabulary is
+    fitted per request and does not line up with the model's features.
+    """
+    from scipy.sparse import csr_matrix
+    
+    # Add some common positive and negative words to help the vectorizer learn vocabulary
+    corpus = [
+        processed_text,
+        "good great excellent amazing wonderful fantastic love like enjoy happy positive nice beautiful",
+        "bad terrible awful horrible hate dislike negative sad angry disappointed worse worst poor"
+    ]
+    
+    # Fit the vectorizer on our small corpus
+    tfidf_matrix = create_vectorizer().fit_transform(corpus)
+    
+    # Get the feature vector for our input text (first item in corpus).
+    # max_features caps the vocabulary at N_FEATURES, so widening the sparse
+    # row to the model's input size only changes its shape - no zero-fill.
+    row = tfidf_matrix[0]
+    return csr_matrix((row.data, row.indices, row.indptr), shape=(1, N_FEATURES))
+
+
+@lru_cache(maxsize=None)
+def quantize_linear_model(model: Any) -> Optional[tuple]:
+    """
+    Quantize the weights of a binary linear classifier (e.g. LinearSVC) to int8.
+    Returns (weights, scale, intercept, classes), or None when the model is not
+    a binary linear model without probability estimates (such as an RBF SVC).
+    """
+    import numpy as np
+    
+    coef = getattr(model, 'coef_', None)
+    if coef is None or hasattr(model, 'predict_proba') or coef.shape[0] != 1:
+        return None
+    
+    # coef_ is sparse after sparsify()
+    weights = np.asarray(coef.toarray() if hasattr(coef, 'toarray') else coef, dtype=np.float64)[0]
+    
+    # Symmetric per-model scale mapping the largest weight to +/-127
+    max_weight = float(np.abs(weights).max())
+    scale = max_weight / 127 if max_weight > 0 else 1.0
+    weights_int8 = np.round(weights / scale).astype(np.int8)
+    
+    return weights_int8, scale, float(np.ravel(model.intercept_)[0]), model.classes_
+
+
+def vectorize_texts(texts: List[str], model: Any):
+    """Preprocess and vectorize texts for a standalone classifier."""
+    # Preprocess text
+    processed_texts = [preprocess_text(text) for text in texts]
+    
+    try:
+        vectorizer = load_vectorizer()
+        if vectorizer is not None:
+            # Fixed training vocabulary - transform yields sparse rows directly
+            features = vectorizer.transform(processed_texts)
         else:
-            # Model is a standalone classifier (SVM) - need to vectorize text
-            # Preprocess text
-            processed_text = preprocess_text(text)
+            from scipy.sparse import vstack
+            features = vstack([fit_fallback_vector(text) for text in processed_texts], format='csr')
+        
+        # Keep the rows sparse unless the model cannot take them:
+        # libsvm models fitted on dense data reject sparse input
+        if not getattr(model, '_sparse', True):
+            features = features.toarray()
+        
+        return features
+    
+    except Exception as e:
+        print(f"Error in vectorization: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+def margin_confidences(decisions) -> List[float]:
+    """Map decision margins to confidences in [0.5, 1) with a logistic sigmoid."""
+    import numpy as np
+    return (1.0 / (1.0 + np.exp(-np.abs(decisions)))).tolist()
+
+
+@lru_cache(maxsize=8)
+def get_predict_fn(model: Any) -> Callable:
+    """
+    Resolve once per model how predictions are made, so the per-request path
+    skips the capability checks. Returns a function mapping a list of cleaned
+    texts to (predictions, confidences).
+    
+    Binary models with a decision function get both the label and the
+    confidence from one decision_function call; the confidence is the
+    logistic sigmoid of the margin. predict_proba is only a fallback.
+    """
+    import numpy as np
+    
+    # Check if model is a pipeline (contains preprocessing steps)
+    if hasattr(model, 'named_steps'):
+        # Model is a Pipeline - use it directly with raw text
+        featurize = lambda texts: texts
+        default_confidence = 0.9
+    else:
+        # Model is a standalone classifier (SVM) - need to vectorize text
+        featurize = lambda texts: vectorize_texts(texts, model)
+        default_confidence = 0.8
+        
+        quantized = quantize_linear_model(model)
+        if quantized is not None:
+            weights, scale, intercept, classes = quantized
             
-            # Create and fit vectorizer on the single text sample
-            # Note: This is a limitation - ideally we'd have the original vectorizer
-            # But we'll create one that matches the expected feature count
-            vectorizer = create_vectorizer()
+            def predict_quantized(texts):
+                # Linear model: a single sparse mat-vec with int8 weights
+                decisions = (featurize(texts) @ weights) * scale + intercept
+                return classes[(decisions > 0).astype(int)], margin_confidences(decisions)
             
-            # For a single prediction, we need to handle the vectorizer carefully
-            # Since we don't have training data, we'll create a basic TF-IDF vector
+            return predict_quantized
+    
+    classes = getattr(model, 'classes_', None)
+    if hasattr(model, 'decision_function') and classes is not None and len(classes) == 2:
+        def predict_with_decision(texts):
+            # Positive margins correspond to classes_[1]
+            decisions = np.asarray(model.decision_function(featurize(texts))).ravel()
+            return classes[(decisions > 0).astype(int)], margin_confidences(decisions)
+        
+        return predict_with_decision
+    
+    if hasattr(model, 'predict_proba'):
+        def predict_with_proba(texts):
+            features = featurize(texts)
+            predictions = model.predict(features)
             try:
-                from sklearn.feature_extraction.text import TfidfVectorizer
-                import numpy as np
-                
-                # Create a simple corpus with just our text to fit the vectorizer
-                # This is not ideal but it's a workaround for the missing original vectorizer
-                
-                # Add some common positive and negative words to help the vectorizer learn vocabulary
-                corpus = [
-                    processed_text,
-                    "good great excellent amazing wonderful fantastic love like enjoy happy positive nice beautiful",
-                    "bad terrible awful horrible hate dislike negative sad angry disappointed worse worst poor"
-                ]
-                
-                # Create and fit the vectorizer
-                vectorizer = TfidfVectorizer(
-                    max_features=1145,
-                    ngram_range=(1, 2),
-                    min_df=1,
-                    max_df=0.95,
-                    stop_words='english',
-                    lowercase=True
-                )
-                
-                # Fit the vectorizer on our small corpus
-                tfidf_matrix = vectorizer.fit_transform(corpus)
-                
-                # Get the feature vector for our input text (first item in corpus)
-                feature_vector = tfidf_matrix[0].toarray()
-                
-                # Ensure we have exactly 1145 features
-                if feature_vector.shape[1] != 1145:
-                    # Pad or truncate to match expected size
-                    padded_vector = np.zeros((1, 1145))
-                    min_features = min(feature_vector.shape[1], 1145)
-                    padded_vector[0, :min_features] = feature_vector[0, :min_features]
-                    feature_vector = padded_vector
-                
-                # Make prediction using the feature vector
-                prediction = model.predict(feature_vector)[0]
-                
-                if hasattr(model, 'predict_proba'):
-                    try:
-                        proba = model.predict_proba(feature_vector)[0]
-                        confidence = float(max(proba))
-                    except:
-                        confidence = 0.8
-                else:
-                    confidence = 0.8
-                    
-            except Exception as e:
-                print(f"Error in vectorization: {str(e)}", file=sys.stderr)
-                sys.exit(1)
-        
-        # Map prediction to sentiment labels (0 = negative, 1 = positive)
-        if prediction == 0:
-            sentiment = 'negative'
-        elif prediction == 1:
-            sentiment = 'positive'
-        else:
-            sentiment = 'unknown'
+                confidences = model.predict_proba(features).max(axis=1).tolist()
+            except:
+                confidences = [default_confidence] * len(texts)
+            return predictions, confidences
         
-        return {
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'prediction_raw': str(prediction)
-        }
+        return predict_with_proba
+    
+    def predict_only(texts):
+        return model.predict(featurize(texts)), [default_confidence] * len(texts)
+    
+    return predict_only
+
+
+def predict_sentiments(texts: List[str], model: Any) -> List[Dict[str, Any]]:
+    """
+    Predict sentiment for a batch of texts using the loaded model.
+    Preprocessing, vectorization and the model calls each run once for the
+    whole batch. Uses only the model.pkl file for prediction with proper
+    text vectorization.
+    """
+    try:
+        # Validate input
+        if not texts:
+            raise ValueError("Input texts cannot be empty")
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Input text cannot be empty")
+        
+        # Clean input text
+        texts = [text.strip() for text in texts]
+        
+        predictions, confidences = get_predict_fn(model)(texts)
+        
+        # Map predictions to sentiment labels (0 = negative, 1 = positive)
+        return [
+            {
+                'sentiment': SENTIMENT_LABELS.get(prediction, 'unknown'),
+                'confidence': float(confidence),
+                'prediction_raw': str(prediction)
+            }
+            for prediction, confidence in zip(predictions, confidences)
+        ]
         
     except Exception as e:
         print(f"Error during prediction: {str(e)}", file=sys.stderr)
         sys.exit(1)
 
 
+def predict_sentiment(text: str, model: Any) -> Dict[str, Any]:
+    """Predict sentiment for a single text using the loaded model."""
+    return predict_sentiments([text], model)[0]
+
+
 def validate_input(text: str) -> str:
     """Validate and clean input text."""
     if not text:
         raise ValueError("Input text is required")
     
     # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
+    text = ' '.join(text.split())
     
     if len(text) < 3:
         raise ValueError("Input text is too short (minimum 3 characters)")
@@ -401,22 +799,182 @@ def validate_input(text: str) -> str:
     return text
 
 
+def predict_lines(lines: List[str], model: Any) -> List[Dict[str, Any]]:
+    """
+    Predict sentiment for each line of a batch, one result per line.
+    Invalid or blank lines get {"error": "..."} in their place; the valid
+    lines are predicted together in a single batch.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(lines)
+    texts = []
+    positions = []
+    
+    for position, line in enumerate(lines):
+        try:
+            texts.append(validate_input(line))
+            positions.append(position)
+        except ValueError as e:
+            results[position] = {'error': f"Input validation error: {str(e)}"}
+    
+    if texts:
+        for position, result in zip(positions, predict_sentiments(texts, model)):
+            results[position] = result
+    
+    return results
+
+
+class SentimentRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handle newline-delimited JSON requests of the form {"text": "..."}.
+    Each request is answered with {"result": {...}} or {"error": "..."}.
+    """
+    
+    def handle(self):
+        for line in self.rfile:
+            try:
+                payload = json.loads(line)
+                text = validate_input(payload.get('text', ''))
+                response = {'result': predict_sentiment(text, load_model())}
+            except ValueError as e:
+                response = {'error': f"Input validation error: {str(e)}"}
+            except SystemExit:
+                # predict_sentiment exits on failure; keep the server alive
+                response = {'error': "Prediction failed"}
+            except Exception as e:
+                response = {'error': f"Unexpected error: {str(e)}"}
+            
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+def serve(socket_path: str = SOCKET_PATH):
+    """Run a persistent server that keeps the model loaded between requests."""
+    if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+        print("Error: Unix sockets are not supported on this platform", file=sys.stderr)
+        sys.exit(1)
+    
+    # Remove a stale socket left behind by a previous server, but never take
+    # over from a server that is still accepting connections
+    if os.path.exists(socket_path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        except OSError as e:
+            print(f"Error: Cannot use socket {socket_path}: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        else:
+            print(f"Error: A sentiment server is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+    
+    # Load the model and preprocessing resources up front
+    load_model()
+    load_vectorizer()
+    
+    server = socketserver.ThreadingUnixStreamServer(socket_path, SentimentRequestHandler)
+    server.daemon_threads = True
+    
+    # Exit cleanly on SIGTERM so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"Sentiment server listening on {socket_path}", file=sys.stderr)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def request_prediction(text: str, socket_path: str = SOCKET_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Ask a running sentiment server for a prediction.
+    Returns None when no server is reachable so the caller can predict in-process.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SOCKET_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall((json.dumps({'text': text}) + '\n').encode('utf-8'))
+            with sock.makefile('r', encoding='utf-8') as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+    
+    if not line:
+        return None
+    
+    response = json.loads(line)
+    if 'error' in response:
+        raise RuntimeError(response['error'])
+    
+    return response['result']
+
+
 def main():
     """Main function to run sentiment analysis."""
     try:
+        # Server mode: load the model once and answer many requests
+        if len(sys.argv) in (2, 3) and sys.argv[1] == '--serve':
+            serve(sys.argv[2] if len(sys.argv) == 3 else SOCKET_PATH)
+            return
+        
+        # Batch mode: one text per stdin line, one JSON result per output line
+        if len(sys.argv) == 2 and sys.argv[1] == '--batch':
+            # One output line per input line, in order, so results can be
+            # matched back to their texts by position
+            lines = sys.stdin.read().splitlines()
+            model = load_model() if lines else None
+            
+            for result in predict_lines(lines, model):
+                print(json.dumps(result))
+            return
+        
+        # Offline step: re-save the model in joblib's memory-mappable format
+        if len(sys.argv) == 2 and sys.argv[1] == '--convert-model':
+            model_path = convert_model()
+            print(f"Model re-saved to {model_path}", file=sys.stderr)
+            return
+        
+        # Offline step: train the hashing pipeline on a labelled corpus
+        if len(sys.argv) in (3, 4) and sys.argv[1] == '--train':
+            model_path = train_model(*sys.argv[2:])
+            print(f"Model saved to {model_path}", file=sys.stderr)
+            return
+        
+        # Offline step: fit the vectorizer on the training corpus
+        if len(sys.argv) == 3 and sys.argv[1] == '--fit-vectorizer':
+            vectorizer_path = fit_vectorizer(sys.argv[2])
+            print(f"Vectorizer saved to {vectorizer_path}", file=sys.stderr)
+            return
+        
         # Validate command line arguments
         if len(sys.argv) != 2:
             print("Usage: python sentiment_analysis.py <text>", file=sys.stderr)
+            print("       python sentiment_analysis.py --batch < texts.txt", file=sys.stderr)
+            print("       python sentiment_analysis.py --serve [socket_path]", file=sys.stderr)
+            print("       python sentiment_analysis.py --fit-vectorizer <corpus_path>", file=sys.stderr)
+            print("       python sentiment_analysis.py --convert-model", file=sys.stderr)
+            print("       python sentiment_analysis.py --train <labelled_corpus_path> [model_path]", file=sys.stderr)
             sys.exit(1)
         
         # Get and validate input text
         input_text = validate_input(sys.argv[1])
         
-        # Load the model
-        model = load_model()
-        
-        # Make prediction (no fallbacks - model only)
-        result = predict_sentiment(input_text, model)
+        # Prefer a running server; fall back to loading the model in-process
+        result = request_prediction(input_text)
+        if result is None:
+            # Load the model
+            model = load_model()
+            
+            # Make prediction (no fallbacks - model only)
+            result = predict_sentiment(input_text, model)
         
         # Output result as JSON
         print(json.dumps(result, indent=2))
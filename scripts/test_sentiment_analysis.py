@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the sentiment analysis preprocessing and batch prediction.
+Run with: python -m pytest scripts  (or python -m unittest discover scripts)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sentiment_analysis
+
+try:
+    import nltk
+except ImportError:
+    nltk = None
+
+try:
+    from sklearn.datasets import make_classification
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import LinearSVC
+except ImportError:
+    LinearSVC = None
+
+
+@unittest.skipIf(nltk is None, "NLTK not available")
+class TextPreprocessorTest(unittest.TestCase):
+
+    def setUp(self):
+        # Stopword removal needs downloaded NLTK data; stemming does not
+        self.preprocessor = sentiment_analysis.TextPreprocessor(remove_stopwords=False)
+
+    def test_batch_matches_single_texts(self):
+        batch = [
+            "Loved this quiz!!! 10/10",
+            "see http://x.com\xa0great movie, mail a@b.com awesome",
+            "www.example.com　Terrible\ttiming, contact me@x.org now",
+            "The questions were confusing and the timer was way too short.",
+            "",
+        ]
+
+        self.assertEqual(
+            self.preprocessor.transform(batch),
+            [self.preprocessor.transform(text)[0] for text in batch]
+        )
+
+    def test_contractions_split_like_word_tokenize(self):
+        preprocessor = sentiment_analysis.TextPreprocessor(remove_stopwords=False, stemming=False)
+
+        self.assertEqual(
+            preprocessor.transform("I cannot stop, gonna WANNA retry. Gotta lemme gimme!"),
+            ["can not stop gon na wan na retry got ta lem me gim me"]
+        )
+        self.assertEqual(preprocessor.transform("cannotx gonnas"), ["cannotx gonnas"])
+
+
+class PreprocessTextTest(unittest.TestCase):
+
+    def test_removes_urls_emails_and_non_letters(self):
+        self.assertEqual(
+            sentiment_analysis.preprocess_text("see http://x.com\xa0great movie, mail a@b.com awesome"),
+            "see great movie mail awesome"
+        )
+        self.assertEqual(sentiment_analysis.preprocess_text("Très bien 10/10 日本語!"), "trs bien")
+
+    def test_translate_table_stays_bounded(self):
+        sentiment_analysis.preprocess_text(''.join(map(chr, range(0x80, 0x20000))))
+
+        # Only the ASCII range and non-ASCII whitespace are stored
+        self.assertLess(len(sentiment_analysis._LETTERS_AND_SPACE), 0x80 + 64)
+
+
+class KeywordModel:
+    """Pipeline-like stand-in for model.pkl: positive iff the text says 'good'."""
+
+    named_steps = {}
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, texts):
+        self.batches.append(list(texts))
+        return [int('good' in text) for text in texts]
+
+
+class PredictLinesTest(unittest.TestCase):
+
+    def test_one_result_per_line(self):
+        model = KeywordModel()
+        results = sentiment_analysis.predict_lines(
+            ["good quiz", "", "ok", "   ", "bad  timer", "x" * 10001],
+            model
+        )
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0]['sentiment'], 'positive')
+        self.assertEqual(results[4]['sentiment'], 'negative')
+        for position in (1, 2, 3, 5):
+            self.assertTrue(results[position]['error'].startswith("Input validation error"))
+
+        # Valid lines are still predicted in a single batch
+        self.assertEqual(model.batches, [["good quiz", "bad timer"]])
+
+    def test_no_valid_lines(self):
+        model = KeywordModel()
+        results = sentiment_analysis.predict_lines(["", "no"], model)
+
+        self.assertEqual([sorted(result) for result in results], [['error'], ['error']])
+        self.assertEqual(model.batches, [])
+
+
+@unittest.skipIf(LinearSVC is None, "Scikit-learn not available")
+class PredictFnTest(unittest.TestCase):
+
+    def setUp(self):
+        self.features, self.labels = make_classification(
+            n_samples=200, n_features=20, n_informative=10, random_state=0
+        )
+
+    def predict(self, model):
+        # Feed the numeric features straight to the model instead of texts
+        with mock.patch.object(sentiment_analysis, 'vectorize_texts', return_value=self.features):
+            return sentiment_analysis.get_predict_fn(model)([''] * len(self.features))
+
+    def test_int8_linear_model_matches_predict(self):
+        for fit_intercept in (True, False):
+            with self.subTest(fit_intercept=fit_intercept):
+                model = LinearSVC(fit_intercept=fit_intercept, random_state=0).fit(self.features, self.labels)
+                quantized = sentiment_analysis.quantize_linear_model(model)
+                self.assertIsNotNone(quantized)
+
+                predictions, confidences = self.predict(model)
+
+                # Rounding moves each weight by at most scale/2, so labels can
+                # only flip for samples whose margin is within that error
+                scale = quantized[1]
+                clear = abs(model.decision_function(self.features)) > abs(self.features).sum(axis=1) * scale / 2
+                self.assertGreater(clear.mean(), 0.9)
+                self.assertEqual(list(predictions[clear]), list(model.predict(self.features)[clear]))
+                self.assertTrue(all(0.5 <= confidence < 1 for confidence in confidences))
+
+    def test_decision_function_matches_predict(self):
+        # predict_proba rules out the int8 path, leaving decision_function
+        model = LogisticRegression().fit(self.features, self.labels)
+        self.assertIsNone(sentiment_analysis.quantize_linear_model(model))
+
+        predictions, confidences = self.predict(model)
+
+        self.assertEqual(list(predictions), list(model.predict(self.features)))
+        self.assertTrue(all(0.5 <= confidence < 1 for confidence in confidences))
+
+
+@unittest.skipIf(LinearSVC is None or nltk is None, "Scikit-learn or NLTK not available")
+class TrainModelTest(unittest.TestCase):
+
+    def test_model_trained_from_cli_loads_on_import(self):
+        import joblib
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            corpus_path = os.path.join(tmp_dir, 'corpus.tsv')
+            model_path = os.path.join(tmp_dir, 'model.pkl')
+            with open(corpus_path, 'w', encoding='utf-8') as f:
+                for _ in range(10):
+                    f.write("1\tgreat quiz, loved the questions\n")
+                    f.write("0\tterrible timer and awful questions\n")
+
+            # Run as a script, where the module is __main__
+            subprocess.run(
+                [sys.executable, sentiment_analysis.__file__, '--train', corpus_path, model_path],
+                check=True, capture_output=True
+            )
+            model = joblib.load(model_path)
+
+        self.assertIs(type(model.named_steps['preprocessor']), sentiment_analysis.TextPreprocessor)
+        self.assertEqual(
+            [result['sentiment'] for result in sentiment_analysis.predict_sentiments(["loved it", "awful"], model)],
+            ['positive', 'negative']
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()